@@ -1,18 +1,93 @@
-from flask import Flask, request, jsonify, render_template_string
+from flask import Flask, Response, request, jsonify
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 import os
+import asyncio
+import collections
+import functools
+import hashlib
+import queue
+import random
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 import requests
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from cachetools import TTLCache
+import msgspec
+import orjson
 from dotenv import load_dotenv
 import logging
 
 # Load environment variables
 load_dotenv()
 
+class ORJSONProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson for faster encoding of large diet plans.
+    
+    Falls back to the stdlib implementation for options orjson can't express.
+    """
+    
+    # Match orjson's behaviour: unsorted keys and raw UTF-8 unless a caller asks otherwise
+    sort_keys = False
+    ensure_ascii = False
+    
+    # Datetimes and dataclasses go through self.default so Flask's formatting is kept
+    _options = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+    
+    def dumps(self, obj, **kwargs):
+        encoded = self._encode(obj, **kwargs)
+        if encoded is None:
+            return super().dumps(obj, **kwargs)
+        return encoded.decode()
+    
+    def loads(self, s, **kwargs):
+        # Hooks such as Flask's session serializer's object_hook need the stdlib decoder
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        # Same argument handling as jsonify(): one value, several values as a list, or keyword pairs
+        if args and kwargs:
+            raise TypeError("response() takes either args or kwargs, not both")
+        if kwargs:
+            obj = kwargs
+        elif len(args) == 1:
+            obj = args[0]
+        else:
+            obj = list(args) or None
+        
+        dump_args = {}
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            dump_args['indent'] = 2
+        
+        # Pass orjson's bytes straight through, skipping a bytes -> str -> bytes round trip
+        return self._app.response_class(self._encode(obj, **dump_args), mimetype=self.mimetype)
+    
+    def _encode(self, obj, default=None, sort_keys=None, indent=None, separators=None, ensure_ascii=None, **kwargs):
+        """Encode with orjson, or return None if the options need the stdlib encoder"""
+        if kwargs or ensure_ascii:
+            return None
+        # orjson output is always compact, which is what these separators ask for
+        if separators is not None and tuple(separators) != (",", ":"):
+            return None
+        
+        option = self._options
+        if sort_keys if sort_keys is not None else self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent is not None:
+            if indent != 2:
+                return None
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=default or self.default, option=option)
+
 app = Flask(__name__,
         static_folder="../frontend",   # your frontend folder
         static_url_path=""
 )
+app.json = ORJSONProvider(app)
 CORS(app)
 
 # Configure logging
@@ -23,6 +98,253 @@ logger = logging.getLogger(__name__)
 HUGGINGFACE_API_TOKEN = os.getenv('HUGGINGFACE_API_TOKEN')
 HUGGINGFACE_API_URL = "https://api-inference.huggingface.co/models/"
 
+# Prompt sent to the model; filled in per user with str.format_map
+PROMPT_TEMPLATE = """Create a detailed 7-day diet plan for:
+Name: {name}
+Age: {age} years
+Gender: {gender}
+Weight: {weight} kg
+Height: {height} cm
+BMI: {bmi} ({bmi_category})
+Daily Calories: {daily_calories}
+Smoking: {smoking}
+Drinking: {drinking}
+
+Please provide:
+1. Daily meal schedule with specific foods
+2. Portion sizes and nutritional focus
+3. Pre/post workout meals
+4. Hydration recommendations
+5. Lifestyle-specific advice based on smoking/drinking habits
+
+Format as a structured weekly plan with breakfast, lunch, dinner, and snacks for each day."""
+
+# Generated text keyed by prompt hash, so resubmitting an identical request skips the API call.
+# The prompt includes the user's name, so entries are never shared between different users.
+_hf_cache = TTLCache(maxsize=2048, ttl=3600)
+_hf_cache_lock = threading.Lock()
+
+# Request schemas; strict=False decoding also accepts numbers sent as strings
+class UserData(msgspec.Struct):
+    name: str
+    age: int
+    height: float
+    weight: float
+    gender: str
+    smoking: str
+    drinking: str
+
+class BMIInput(msgspec.Struct):
+    weight: float
+    height: float
+
+class BMIBatchInput(msgspec.Struct):
+    users: list[BMIInput]
+
+class BatchingInferenceClient:
+    def __init__(self, session, api_url, parameters, batch_size=8, max_wait_ms=50, max_concurrency=10):
+        self.session = session
+        self.api_url = api_url
+        self.parameters = parameters
+        self.batch_size = batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue = queue.Queue()
+        # Batches are sent in parallel, but never more than max_concurrency calls at once
+        self._senders = ThreadPoolExecutor(max_workers=max_concurrency)
+        self._worker = None
+        self._worker_lock = threading.Lock()
+    
+    def submit(self, prompt):
+        """Queue a prompt and return a future for its generated output"""
+        self._ensure_worker()
+        future = Future()
+        self._queue.put((prompt, future))
+        return future
+    
+    def _ensure_worker(self):
+        """Start the batching thread lazily so it also exists in forked server workers"""
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, daemon=True)
+                self._worker.start()
+    
+    def _run(self):
+        """Collect prompts until the batch is full or the wait window closes"""
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._senders.submit(self._flush, batch)
+    
+    def _flush(self, batch):
+        """Send a batch of prompts in one API call and resolve each future"""
+        payload = {
+            "inputs": [prompt for prompt, _ in batch],
+            "parameters": self.parameters
+        }
+        
+        try:
+            # The session retries 429/502/504; a 503 is retried here unless it is a loading notice
+            for attempt in range(3):
+                response = self.session.post(self.api_url, json=payload, timeout=(3, 30))
+                if response.status_code != 503 or "estimated_time" in response.text or attempt == 2:
+                    break
+                time.sleep(0.5 * 2 ** attempt)
+            
+            if response.status_code == 200:
+                ai_response = response.json()
+            elif response.status_code == 503 and "estimated_time" in response.text:
+                # Model is still loading; hand the notice back so callers can fall back
+                ai_response = response.json()
+            else:
+                raise RuntimeError(f"API error: {response.status_code} - {response.text}")
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        
+        # A list must hold one entry per prompt; only a non-list (e.g. a loading notice) applies to the whole batch
+        if isinstance(ai_response, list):
+            if len(ai_response) != len(batch):
+                error = RuntimeError(f"API returned {len(ai_response)} results for {len(batch)} prompts")
+                for _, future in batch:
+                    future.set_exception(error)
+                return
+            results = ai_response
+        else:
+            results = [ai_response] * len(batch)
+        
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
+
+# Sample meal options the weekly plan draws from
+BREAKFAST_OPTIONS = (
+    "Oatmeal with banana and almonds",
+    "Greek yogurt with berries and granola",
+    "Scrambled eggs with whole grain toast",
+    "Protein smoothie with spinach and fruits"
+)
+
+LUNCH_OPTIONS = (
+    "Grilled chicken with quinoa and vegetables",
+    "Lentil curry with brown rice",
+    "Fish with sweet potato and broccoli",
+    "Chickpea salad with mixed greens"
+)
+
+DINNER_OPTIONS = (
+    "Lean beef with roasted vegetables",
+    "Salmon with asparagus and wild rice",
+    "Turkey meatballs with zucchini noodles",
+    "Tofu stir-fry with brown rice"
+)
+
+SNACK_OPTIONS = (
+    "Apple with almond butter",
+    "Mixed nuts and dried fruits",
+    "Greek yogurt with honey",
+    "Protein bar or shake"
+)
+
+# Per-meal calories and daily macro grams derived from a daily calorie target
+CalorieBreakdown = collections.namedtuple(
+    'CalorieBreakdown',
+    'breakfast snack1 lunch snack2 dinner protein_g carb_g fat_g'
+)
+
+def _age_bucket(age):
+    """Group ages into the ranges the lifestyle recommendations distinguish"""
+    age = int(age)
+    if age < 25:
+        return 0
+    elif age > 40:
+        return 2
+    return 1
+
+def _lifestyle_recommendations(smoking, drinking, age_bucket):
+    """Build lifestyle recommendations from smoking/drinking habits and age bucket"""
+    recommendations = []
+    
+    if smoking == 'yes':
+        recommendations.append({
+            'type': 'warning',
+            'message': 'Smoking reduces oxygen delivery to muscles. Consider quitting for better workout performance and recovery.'
+        })
+        recommendations.append({
+            'type': 'advice',
+            'message': 'Increase Vitamin C intake (citrus fruits, bell peppers) to combat oxidative stress from smoking.'
+        })
+    
+    if drinking == 'yes':
+        recommendations.append({
+            'type': 'warning',
+            'message': 'Alcohol can interfere with muscle protein synthesis and recovery. Limit intake, especially around workout times.'
+        })
+        recommendations.append({
+            'type': 'advice',
+            'message': 'If you drink, ensure adequate hydration and consider B-complex vitamins to support metabolism.'
+        })
+    
+    # Age-specific recommendations
+    if age_bucket == 0:
+        recommendations.append({
+            'type': 'info',
+            'message': 'Focus on building healthy eating habits early. Your metabolism is naturally higher at this age.'
+        })
+    elif age_bucket == 2:
+        recommendations.append({
+            'type': 'info',
+            'message': 'Prioritize protein intake and calcium for bone health. Consider adding resistance training.'
+        })
+    
+    return recommendations
+
+@functools.lru_cache(maxsize=1024)
+def _build_fallback_plan(daily_calories, smoking, drinking, age_bucket):
+    """Build the deterministic part of the fallback plan.
+    
+    The result is cached and shared between requests, so callers must not mutate it.
+    """
+    # Meal calorie and macro distribution
+    calories = CalorieBreakdown(
+        breakfast=round(daily_calories * 0.25),
+        snack1=round(daily_calories * 0.10),
+        lunch=round(daily_calories * 0.30),
+        snack2=round(daily_calories * 0.10),
+        dinner=round(daily_calories * 0.25),
+        protein_g=round(daily_calories * 0.25 / 4),
+        carb_g=round(daily_calories * 0.45 / 4),
+        fat_g=round(daily_calories * 0.30 / 9)
+    )
+    
+    return {
+        'calories': calories,
+        'macros': {
+            'protein': f"{calories.protein_g}g",
+            'carbs': f"{calories.carb_g}g",
+            'fats': f"{calories.fat_g}g"
+        },
+        'recommendations': _lifestyle_recommendations(smoking, drinking, age_bucket),
+        'general_tips': [
+            "Drink 8-10 glasses of water daily",
+            "Eat every 3-4 hours to maintain metabolism",
+            "Include protein in every meal for muscle recovery",
+            "Choose complex carbohydrates over simple sugars",
+            "Eat your largest meal 2-3 hours before workouts",
+            "Have a post-workout meal within 30 minutes",
+            "Limit processed foods and added sugars"
+        ]
+    }
+
 class DietPlanGenerator:
     def __init__(self):
         # Using free models from Hugging Face
@@ -31,6 +353,39 @@ class DietPlanGenerator:
             "Authorization": f"Bearer {HUGGINGFACE_API_TOKEN}",
             "Content-Type": "application/json"
         }
+        
+        # Pooled session so keep-alive connections to Hugging Face are reused across requests
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(
+            pool_connections=20,
+            pool_maxsize=100,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.5,
+                # 503 is left out: Hugging Face uses it for "model loading" notices, which
+                # are handled directly so the model is marked cold on the first response
+                status_forcelist=[429, 502, 504],
+                allowed_methods=frozenset(["POST"]),
+                raise_on_status=False
+            )
+        ))
+        self.session.headers.update(self.headers)
+        
+        # While the model is loading on Hugging Face, skip the API and serve the fallback plan
+        self._model_cold_until = 0.0
+        
+        # Prompts arriving close together share a single inference call
+        self.batcher = BatchingInferenceClient(
+            self.session,
+            f"{HUGGINGFACE_API_URL}{self.model_name}",
+            parameters={
+                # Only ~500 characters are shown, so cap new tokens and skip echoing the prompt
+                "max_new_tokens": 200,
+                "return_full_text": False,
+                "temperature": 0.7,
+                "do_sample": True
+            }
+        )
     
     def calculate_bmr(self, weight, height, age, gender):
         """Calculate Basal Metabolic Rate"""
@@ -57,6 +412,34 @@ class DietPlanGenerator:
         else:
             return "Obese", "Consult healthcare provider, focus on sustainable weight loss"
     
+    def calculate_bmi_batch(self, measurements):
+        """Calculate BMI and category for a list of (weight, height) pairs"""
+        results = []
+        for weight, height in measurements:
+            bmi = self.calculate_bmi(weight, height)
+            category, advice = self.get_bmi_category(bmi)
+            results.append({
+                'bmi': bmi,
+                'category': category,
+                'advice': advice
+            })
+        return results
+    
+    def mark_model_cold(self, estimated_time):
+        """Skip API calls until the model's estimated load time has passed"""
+        logger.info(f"Model loading, estimated time: {estimated_time} seconds")
+        self._model_cold_until = time.monotonic() + float(estimated_time)
+    
+    def warm_up(self):
+        """Send a short prompt so the model starts loading before real traffic arrives"""
+        try:
+            response = self.session.post(self.batcher.api_url, json={"inputs": "Hello"}, timeout=(3, 30))
+            ai_response = response.json()
+            if isinstance(ai_response, dict) and "estimated_time" in ai_response:
+                self.mark_model_cold(ai_response['estimated_time'])
+        except Exception as e:
+            logger.warning(f"Model warm-up failed: {str(e)}")
+    
     async def generate_ai_diet_plan(self, user_data):
         """Generate diet plan using Hugging Face LLM"""
         try:
@@ -74,60 +457,49 @@ class DietPlanGenerator:
             daily_calories = round(bmr * 1.5)  # Moderate activity
             
             # Create detailed prompt for AI
-            prompt = f"""Create a detailed 7-day diet plan for:
-            Name: {user_data['name']}
-            Age: {user_data['age']} years
-            Gender: {user_data['gender']}
-            Weight: {user_data['weight']} kg
-            Height: {user_data['height']} cm
-            BMI: {bmi} ({bmi_category})
-            Daily Calories: {daily_calories}
-            Smoking: {user_data['smoking']}
-            Drinking: {user_data['drinking']}
-            
-            Please provide:
-            1. Daily meal schedule with specific foods
-            2. Portion sizes and nutritional focus
-            3. Pre/post workout meals
-            4. Hydration recommendations
-            5. Lifestyle-specific advice based on smoking/drinking habits
+            prompt = PROMPT_TEMPLATE.format_map({
+                **user_data,
+                'bmi': bmi,
+                'bmi_category': bmi_category,
+                'daily_calories': daily_calories
+            })
             
-            Format as a structured weekly plan with breakfast, lunch, dinner, and snacks for each day."""
+            # Reuse the generated text for prompts we have already sent
+            cache_key = hashlib.sha256(prompt.encode()).digest()
+            with _hf_cache_lock:
+                cached_text = _hf_cache.get(cache_key)
+            if cached_text is not None:
+                return self.format_ai_response(user_data, cached_text, bmr, bmi, bmi_category, daily_calories)
             
-            # Call Hugging Face API
-            api_url = f"{HUGGINGFACE_API_URL}microsoft/DialoGPT-medium"
+            # Don't wait on a call that will only report the model is still loading
+            if time.monotonic() < self._model_cold_until:
+                return self.generate_fallback_plan(user_data, bmr, bmi, bmi_category, daily_calories)
             
-            payload = {
-                "inputs": prompt,
-                "parameters": {
-                    "max_length": 1000,
-                    "temperature": 0.7,
-                    "do_sample": True
-                }
-            }
+            # Call Hugging Face API through the batcher
+            ai_response = await asyncio.wrap_future(self.batcher.submit(prompt))
             
-            response = requests.post(api_url, headers=self.headers, json=payload)
+            # Batched calls may return a list of generations per prompt
+            if isinstance(ai_response, list):
+                ai_response = ai_response[0] if ai_response else {}
             
-            if response.status_code == 200:
-                ai_response = response.json()
-                
-                # If model is loading, wait and retry
-                if isinstance(ai_response, dict) and "estimated_time" in ai_response:
-                    logger.info(f"Model loading, estimated time: {ai_response['estimated_time']} seconds")
-                    return self.generate_fallback_plan(user_data, bmr, bmi, bmi_category, daily_calories)
-                
-                # Extract generated text
-                if isinstance(ai_response, list) and len(ai_response) > 0:
-                    generated_text = ai_response[0].get('generated_text', '')
-                else:
-                    generated_text = str(ai_response)
-                
-                # Format the response
-                return self.format_ai_response(user_data, generated_text, bmr, bmi, bmi_category, daily_calories)
+            # If model is loading, fall back until it is expected to be ready
+            if isinstance(ai_response, dict) and "estimated_time" in ai_response:
+                self.mark_model_cold(ai_response['estimated_time'])
+                return self.generate_fallback_plan(user_data, bmr, bmi, bmi_category, daily_calories)
             
+            # Extract generated text
+            if isinstance(ai_response, dict):
+                generated_text = ai_response.get('generated_text', '')
             else:
-                logger.error(f"API error: {response.status_code} - {response.text}")
-                return self.generate_fallback_plan(user_data, bmr, bmi, bmi_category, daily_calories)
+                generated_text = str(ai_response)
+            
+            # Only cache real generations, so an empty or unexpected reply isn't pinned for the TTL
+            if isinstance(ai_response, dict) and generated_text:
+                with _hf_cache_lock:
+                    _hf_cache[cache_key] = generated_text
+            
+            # Format the response
+            return self.format_ai_response(user_data, generated_text, bmr, bmi, bmi_category, daily_calories)
                 
         except Exception as e:
             logger.error(f"Error generating AI diet plan: {str(e)}")
@@ -136,14 +508,13 @@ class DietPlanGenerator:
     def generate_fallback_plan(self, user_data, bmr, bmi, bmi_category, daily_calories):
         """Generate a structured diet plan when AI fails"""
         
-        # Macro distribution
-        protein_cals = daily_calories * 0.25
-        carb_cals = daily_calories * 0.45
-        fat_cals = daily_calories * 0.30
-        
-        protein_grams = round(protein_cals / 4)
-        carb_grams = round(carb_cals / 4)
-        fat_grams = round(fat_cals / 9)
+        # Macros, recommendations and tips only depend on these keys, so they are cached
+        plan = _build_fallback_plan(
+            daily_calories,
+            user_data['smoking'],
+            user_data['drinking'],
+            _age_bucket(user_data['age'])
+        )
         
         # Weekly meal plan
         days = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
@@ -158,134 +529,53 @@ class DietPlanGenerator:
                 'bmi': bmi,
                 'bmi_category': bmi_category,
                 'daily_calories': daily_calories,
-                'macros': {
-                    'protein': f"{protein_grams}g",
-                    'carbs': f"{carb_grams}g",
-                    'fats': f"{fat_grams}g"
-                }
+                'macros': plan['macros']
             },
-            'weekly_plan': {},
-            'recommendations': self.get_lifestyle_recommendations(user_data),
-            'general_tips': [
-                "Drink 8-10 glasses of water daily",
-                "Eat every 3-4 hours to maintain metabolism",
-                "Include protein in every meal for muscle recovery",
-                "Choose complex carbohydrates over simple sugars",
-                "Eat your largest meal 2-3 hours before workouts",
-                "Have a post-workout meal within 30 minutes",
-                "Limit processed foods and added sugars"
-            ]
+            # Meals are randomized per request, so they stay outside the cache
+            'weekly_plan': self.generate_weekly_meals(plan['calories'], days, user_data),
+            'recommendations': plan['recommendations'],
+            'general_tips': plan['general_tips']
         }
         
-        # Generate daily meal plans
-        for day in days:
-            meal_plan['weekly_plan'][day] = self.generate_daily_meals(daily_calories, user_data)
-        
         return meal_plan
     
-    def generate_daily_meals(self, daily_calories, user_data):
-        """Generate meals for a single day"""
+    def generate_weekly_meals(self, calories, days, user_data):
+        """Generate meals for each of the given days from a CalorieBreakdown"""
         
-        # Meal calorie distribution
-        breakfast_cals = round(daily_calories * 0.25)
-        snack1_cals = round(daily_calories * 0.10)
-        lunch_cals = round(daily_calories * 0.30)
-        snack2_cals = round(daily_calories * 0.10)
-        dinner_cals = round(daily_calories * 0.25)
-        
-        # Sample meal options (can be randomized)
-        breakfast_options = [
-            "Oatmeal with banana and almonds",
-            "Greek yogurt with berries and granola",
-            "Scrambled eggs with whole grain toast",
-            "Protein smoothie with spinach and fruits"
-        ]
-        
-        lunch_options = [
-            "Grilled chicken with quinoa and vegetables",
-            "Lentil curry with brown rice",
-            "Fish with sweet potato and broccoli",
-            "Chickpea salad with mixed greens"
-        ]
-        
-        dinner_options = [
-            "Lean beef with roasted vegetables",
-            "Salmon with asparagus and wild rice",
-            "Turkey meatballs with zucchini noodles",
-            "Tofu stir-fry with brown rice"
-        ]
-        
-        snack_options = [
-            "Apple with almond butter",
-            "Mixed nuts and dried fruits",
-            "Greek yogurt with honey",
-            "Protein bar or shake"
-        ]
-        
-        import random
+        # Draw each meal slot for the whole week in one call
+        breakfasts = random.choices(BREAKFAST_OPTIONS, k=len(days))
+        morning_snacks = random.choices(SNACK_OPTIONS, k=len(days))
+        lunches = random.choices(LUNCH_OPTIONS, k=len(days))
+        afternoon_snacks = random.choices(SNACK_OPTIONS, k=len(days))
+        dinners = random.choices(DINNER_OPTIONS, k=len(days))
         
         return {
-            'breakfast': {
-                'meal': random.choice(breakfast_options),
-                'calories': breakfast_cals
-            },
-            'morning_snack': {
-                'meal': random.choice(snack_options),
-                'calories': snack1_cals
-            },
-            'lunch': {
-                'meal': random.choice(lunch_options),
-                'calories': lunch_cals
-            },
-            'afternoon_snack': {
-                'meal': random.choice(snack_options),
-                'calories': snack2_cals
-            },
-            'dinner': {
-                'meal': random.choice(dinner_options),
-                'calories': dinner_cals
+            day: {
+                'breakfast': {
+                    'meal': breakfast,
+                    'calories': calories.breakfast
+                },
+                'morning_snack': {
+                    'meal': morning_snack,
+                    'calories': calories.snack1
+                },
+                'lunch': {
+                    'meal': lunch,
+                    'calories': calories.lunch
+                },
+                'afternoon_snack': {
+                    'meal': afternoon_snack,
+                    'calories': calories.snack2
+                },
+                'dinner': {
+                    'meal': dinner,
+                    'calories': calories.dinner
+                }
             }
+            for day, breakfast, morning_snack, lunch, afternoon_snack, dinner
+            in zip(days, breakfasts, morning_snacks, lunches, afternoon_snacks, dinners)
         }
     
-    def get_lifestyle_recommendations(self, user_data):
-        """Get personalized recommendations based on lifestyle"""
-        recommendations = []
-        
-        if user_data['smoking'] == 'yes':
-            recommendations.append({
-                'type': 'warning',
-                'message': 'Smoking reduces oxygen delivery to muscles. Consider quitting for better workout performance and recovery.'
-            })
-            recommendations.append({
-                'type': 'advice',
-                'message': 'Increase Vitamin C intake (citrus fruits, bell peppers) to combat oxidative stress from smoking.'
-            })
-        
-        if user_data['drinking'] == 'yes':
-            recommendations.append({
-                'type': 'warning',
-                'message': 'Alcohol can interfere with muscle protein synthesis and recovery. Limit intake, especially around workout times.'
-            })
-            recommendations.append({
-                'type': 'advice',
-                'message': 'If you drink, ensure adequate hydration and consider B-complex vitamins to support metabolism.'
-            })
-        
-        # Age-specific recommendations
-        age = int(user_data['age'])
-        if age < 25:
-            recommendations.append({
-                'type': 'info',
-                'message': 'Focus on building healthy eating habits early. Your metabolism is naturally higher at this age.'
-            })
-        elif age > 40:
-            recommendations.append({
-                'type': 'info',
-                'message': 'Prioritize protein intake and calcium for bone health. Consider adding resistance training.'
-            })
-        
-        return recommendations
-    
     def format_ai_response(self, user_data, ai_text, bmr, bmi, bmi_category, daily_calories):
         """Format AI response into structured data"""
         # This would parse the AI response and structure it
@@ -305,29 +595,48 @@ class DietPlanGenerator:
 # Initialize diet plan generator
 diet_generator = DietPlanGenerator()
 
+# Start loading the model in the background so the first users don't hit a cold start
+if HUGGINGFACE_API_TOKEN:
+    threading.Thread(target=diet_generator.warm_up, daemon=True).start()
+
+def load_index_html():
+    """Read the frontend entry page once so it can be served from memory"""
+    try:
+        with open(os.path.join(app.static_folder, 'index.html'), 'rb') as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+INDEX_HTML = load_index_html()
+INDEX_ETAG = hashlib.md5(INDEX_HTML).hexdigest() if INDEX_HTML is not None else None
+
 @app.route('/')
 def index():
-    return app.send_static_file('index.html')
+    # Serve from disk in debug mode so frontend edits show up without a restart
+    if INDEX_HTML is None or app.debug:
+        return app.send_static_file('index.html')
+    
+    response = Response(INDEX_HTML, mimetype='text/html')
+    response.set_etag(INDEX_ETAG)
+    return response.make_conditional(request)
 
 @app.route('/api/generate-diet-plan', methods=['POST'])
-def generate_diet_plan():
+async def generate_diet_plan():
     """Generate personalized diet plan using AI"""
     try:
-        # Get user data from request
-        user_data = request.get_json()
-        
-        # Validate required fields
-        required_fields = ['name', 'age', 'height', 'weight', 'gender', 'smoking', 'drinking']
-        for field in required_fields:
-            if field not in user_data:
-                return jsonify({
-                    'error': f'Missing required field: {field}',
-                    'success': False
-                }), 400
+        # Decode and validate user data from request
+        try:
+            user_data = msgspec.structs.asdict(
+                msgspec.json.decode(request.get_data(), type=UserData, strict=False)
+            )
+        except msgspec.DecodeError as e:
+            return jsonify({
+                'error': f'Invalid request data: {e}',
+                'success': False
+            }), 400
         
         # Generate diet plan using AI
-        import asyncio
-        diet_plan = asyncio.run(diet_generator.generate_ai_diet_plan(user_data))
+        diet_plan = await diet_generator.generate_ai_diet_plan(user_data)
         
         return jsonify({
             'success': True,
@@ -342,25 +651,26 @@ def generate_diet_plan():
             'success': False
         }), 500
 
+# The health payload never changes, so encode it once for frequent probes
+HEALTH_JSON = orjson.dumps({
+    'status': 'healthy',
+    'message': 'Everytime Fitness API is running!',
+    'ai_model': 'Hugging Face - Microsoft DialoGPT',
+    'features': ['Diet Plan Generation', 'BMI Calculator', 'Lifestyle Recommendations']
+})
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
-    return jsonify({
-        'status': 'healthy',
-        'message': 'Everytime Fitness API is running!',
-        'ai_model': 'Hugging Face - Microsoft DialoGPT',
-        'features': ['Diet Plan Generation', 'BMI Calculator', 'Lifestyle Recommendations']
-    })
+    return Response(HEALTH_JSON, mimetype='application/json')
 
 @app.route('/api/bmi-calculator', methods=['POST'])
 def calculate_bmi():
     """Calculate BMI and provide basic recommendations"""
     try:
-        data = request.get_json()
-        weight = float(data['weight'])
-        height = float(data['height'])
+        data = msgspec.json.decode(request.get_data(), type=BMIInput, strict=False)
         
-        bmi = diet_generator.calculate_bmi(weight, height)
+        bmi = diet_generator.calculate_bmi(data.weight, data.height)
         category, advice = diet_generator.get_bmi_category(bmi)
         
         return jsonify({
@@ -376,6 +686,29 @@ def calculate_bmi():
             'success': False
         }), 400
 
+@app.route('/api/bmi-calculator/batch', methods=['POST'])
+def calculate_bmi_batch():
+    """Calculate BMI for several users in one request"""
+    try:
+        data = msgspec.json.decode(request.get_data(), type=BMIBatchInput, strict=False)
+        measurements = [(user.weight, user.height) for user in data.users]
+        
+        results = diet_generator.calculate_bmi_batch(measurements)
+        
+        return jsonify({
+            'success': True,
+            'results': results
+        })
+        
+    except Exception:
+        return jsonify({
+            'error': 'Invalid input data',
+            'success': False
+        }), 400
+
 if __name__ == '__main__':
+    # The Werkzeug server handles one request at a time; production runs under Gunicorn (see Procfile)
+    if os.getenv('DEBUG', 'False').lower() != 'true':
+        raise SystemExit("Run with 'gunicorn wsgi:application' or set DEBUG=true to use the development server")
     port = int(os.environ.get('PORT', 5000))
-    app.run(host='0.0.0.0', port=port, debug=os.getenv('DEBUG', 'False').lower() == 'true')
\ No newline at end of file
+    app.run(host='0.0.0.0', port=port, debug=True)
\ No newline at end of file
@@ -0,0 +1,10 @@
+import multiprocessing
+import os
+
+# Several workers with a thread pool each, so concurrent diet-plan requests
+# overlap their waits on the Hugging Face API
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+worker_class = "gthread"
+threads = int(os.environ.get('GUNICORN_THREADS', 8))
+timeout = 60
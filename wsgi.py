@@ -0,0 +1,4 @@
+from backend.app import app
+
+# Entry point for Gunicorn (see Procfile and gunicorn.conf.py)
+application = app